@@ -10,8 +10,9 @@ from datetime import datetime
 from typing import Dict, Any
 import json
 
-from flask import Flask, request, jsonify, send_file, render_template_string
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
+from werkzeug.http import unquote_etag
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.abspath('src'))
@@ -22,7 +23,7 @@ from slidedeckai.layout_analyzer import TemplateAnalyzer
 from pptx import Presentation
 
 # Import HTML UI
-from slidedeckai.ui.html_ui import HTML_UI
+from slidedeckai.ui.html_ui import HTML_UI, HTML_UI_ENCODED, HTML_UI_ETAG, STATIC_ASSETS
 from slidedeckai.helpers.file_processor import FileProcessor
 from openai import OpenAI
 
@@ -38,7 +39,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# UI assets are served from memory by static_asset(), not from a static folder
+app = Flask(__name__, static_folder=None)
 CORS(app)
 
 # Cache for plans, analyzers, and generated slides
@@ -64,6 +66,52 @@ def get_or_create_analyzer(template_key: str) -> TemplateAnalyzer:
     return template_analyzers[template_key]
 
 
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    qualities = {}
+    for token in header.split(','):
+        name, _, params = token.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def encoded_response(identity: bytes, variants: Dict[str, bytes], mimetype: str,
+                     headers: Dict[str, str]) -> Response:
+    """
+    Build a response from the precompressed body matching Accept-Encoding,
+    or a 304 carrying the same caching headers when the client's copy is current
+    """
+    headers = dict(headers, Vary='Accept-Encoding')
+    # If-None-Match may list several tags, use "*" or send our tag back weak (W/)
+    etag, _ = unquote_etag(headers['ETag'])
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    
+    # q=0 refuses an encoding; on equal quality Brotli wins, being listed first
+    qualities = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    body = identity
+    best_quality = 0
+    for encoding in ('br', 'gzip'):
+        quality = qualities.get(encoding, qualities.get('*', 0))
+        if encoding in variants and quality > best_quality:
+            body = variants[encoding]
+            headers['Content-Encoding'] = encoding
+            best_quality = quality
+    
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
 def serialize_plan(research_plan) -> Dict:
     """Serialize ResearchPlan to dict properly"""
     
@@ -126,7 +174,31 @@ def serialize_plan(research_plan) -> Dict:
 @app.route('/')
 def index():
     """Serve the HTML UI"""
-    return render_template_string(HTML_UI)
+    # no-cache: browsers revalidate every load, so a deploy is picked up at once
+    # (the shell is tiny and usually answered with a 304)
+    return encoded_response(
+        HTML_UI,
+        HTML_UI_ENCODED,
+        'text/html',
+        {'ETag': HTML_UI_ETAG, 'Cache-Control': 'no-cache'}
+    )
+
+
+@app.route('/static/<asset_name>')
+def static_asset(asset_name):
+    """Serve a fingerprinted UI asset with a far-future cache lifetime"""
+    if asset_name not in STATIC_ASSETS:
+        return jsonify({'error': 'Asset not found'}), 404
+    
+    # The fingerprinted name already identifies the content
+    etag = f'"{asset_name}"'
+    data, mimetype, variants = STATIC_ASSETS[asset_name]
+    return encoded_response(
+        data,
+        variants,
+        mimetype,
+        {'ETag': etag, 'Cache-Control': 'public, max-age=31536000, immutable'}
+    )
 
 
 @app.route('/api/plan', methods=['POST'])
@@ -386,11 +458,16 @@ def download_report(report_id):
             )
         
         elif format_type == 'json':
-            return jsonify({
-                'report_id': report_id,
-                'template': cached.get('template'),
-                'topic': cached.get('topic')
-            })
+            # Sent as a ready-to-save attachment so the browser downloads it directly
+            return Response(
+                json.dumps({
+                    'report_id': report_id,
+                    'template': cached.get('template'),
+                    'topic': cached.get('topic')
+                }, indent=2),
+                mimetype='application/json',
+                headers={'Content-Disposition': f'attachment; filename=report_{report_id}.json'}
+            )
         
         else:
             return jsonify({'error': 'Unsupported format'}), 400
@@ -426,7 +503,13 @@ def chat_slide():
         data = request.get_json()
         report_id = data.get('report_id')
         slide_idx = data.get('slide_idx')
-        instruction = data.get('instruction')
+        # Clients may batch several messages typed in quick succession into one turn
+        instructions = data.get('instructions')
+        if instructions is None:
+            instructions = [data.get('instruction')] if data.get('instruction') else []
+        if not isinstance(instructions, list) or not all(isinstance(item, str) for item in instructions):
+            return jsonify({'error': 'instructions must be a list of strings'}), 400
+        instruction = '\n'.join(item for item in instructions if item.strip())
 
         if not report_id or not instruction:
             return jsonify({'error': 'Missing parameters'}), 400
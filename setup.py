@@ -0,0 +1,29 @@
+"""
+Build hook that precompresses the web UI's static assets into the wheel.
+All package metadata lives in pyproject.toml.
+"""
+import importlib.util
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+from distutils import log
+
+
+class BuildPyWithPrecompressedAssets(build_py):
+    """Write .gz/.br siblings for the UI scripts and stylesheets in the build tree."""
+
+    def run(self):
+        super().run()
+        # Load the helpers by path: importing the package would pull in its runtime dependencies
+        assets_path = Path(__file__).resolve().parent / 'src' / 'slidedeckai' / 'ui' / '_assets.py'
+        spec = importlib.util.spec_from_file_location('_slidedeckai_assets', assets_path)
+        assets = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(assets)
+        assets.precompress(
+            Path(self.build_lib) / 'slidedeckai' / 'ui' / 'static',
+            log=lambda message: self.announce(message, level=log.INFO)
+        )
+
+
+setup(cmdclass={'build_py': BuildPyWithPrecompressedAssets})
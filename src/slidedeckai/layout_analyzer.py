@@ -280,14 +280,7 @@ class TemplateAnalyzer:
         )
         self._match_subtitles_to_groups(subtitle_placeholders, spatial_groups)
         
-        layout_story = self._infer_layout_story(spatial_groups, has_chart, has_table, kpi_grid, semantic_sections)
-        
-        layout_type = self._infer_layout_type(
-            has_chart, has_table, has_picture,
-            len(content_placeholders), len(text_placeholders), len(semantic_sections), kpi_grid
-        )
-        
-        best_for = self._determine_best_use(
+        layout_type, layout_story, best_for = self._classify_layout(
             has_chart, has_table, has_picture,
             content_placeholders, text_placeholders, spatial_groups, semantic_sections, kpi_grid
         )
@@ -791,74 +784,66 @@ class TemplateAnalyzer:
             if closest_group:
                 subtitle.position_group = f"{closest_group}_subtitle"
     
-    def _infer_layout_story(self, spatial_groups: Dict, has_chart: bool, 
-                       has_table: bool, kpi_grid=None, semantic_sections=None) -> str:
-        """ENHANCED layout story"""
-        if kpi_grid:
-            return f"KPI Dashboard ({kpi_grid['rows']}x{kpi_grid['cols']} metrics)"
-        
-        if semantic_sections and len(semantic_sections) >= 3:
-            return f"{len(semantic_sections)} topic sections"
-        
-        num_groups = len(spatial_groups)
+    def _classify_layout(self, has_chart: bool, has_table: bool, has_picture: bool,
+                         content_placeholders: List[PlaceholderInfo],
+                         text_placeholders: List[PlaceholderInfo],
+                         spatial_groups: Dict,
+                         semantic_sections: List[Dict] = None,
+                         kpi_grid=None) -> Tuple[str, str, List[str]]:
+        """Derive (layout_type, layout_story, best_for) in a single pass"""
+        section_count = len(semantic_sections) if semantic_sections else 0
+        text_count = len(text_placeholders)
         group_names = list(spatial_groups.keys())
+        num_groups = len(group_names)
+        has_two_columns = 'left_column' in spatial_groups and 'right_column' in spatial_groups
         
-        if has_chart:
-            return "Chart with supporting text"
-        if has_table:
-            return "Data table presentation"
-        
-        if 'left_column' in group_names and 'right_column' in group_names:
-            return "Two column comparison"
-        
-        if num_groups == 3 and all('column' in g for g in group_names):
-            return "Three column layout"
-        
-        if num_groups >= 1 and all('row' in g for g in group_names):
-            return f"Vertical stack ({num_groups} sections)"
-        
-        if num_groups == 1:
-            return "Single content area"
-        
-        return f"Multi-area layout ({num_groups} areas)"
-    
-    def _infer_layout_type(self, has_chart: bool, has_table: bool, has_picture: bool,
-                          content_count: int, text_count: int, section_count: int = 0, kpi_grid=None) -> str:
-        """ENHANCED layout type"""
+        # Layout type
         if kpi_grid:
-            return 'kpi_dashboard'
-        if has_chart:
-            return 'chart_layout'
-        if has_table:
-            return 'table_layout'
-        if has_picture:
-            return 'image_layout'
-        
-        if section_count >= 3:
-            return 'multi_section'
+            layout_type = 'kpi_dashboard'
+        elif has_chart:
+            layout_type = 'chart_layout'
+        elif has_table:
+            layout_type = 'table_layout'
+        elif has_picture:
+            layout_type = 'image_layout'
+        elif section_count >= 3:
+            layout_type = 'multi_section'
         elif section_count == 2:
-            return 'double_section'
+            layout_type = 'double_section'
         elif section_count == 1:
-            return 'single_section'
-        
-        if text_count == 0:
-            return 'title_only'
+            layout_type = 'single_section'
+        elif text_count == 0:
+            layout_type = 'title_only'
         elif text_count == 1:
-            return 'single_column'
+            layout_type = 'single_column'
         elif text_count == 2:
-            return 'double_column'
+            layout_type = 'double_column'
         elif text_count == 3:
-            return 'triple_column'
+            layout_type = 'triple_column'
         else:
-            return 'multi_column'
-    
-    def _determine_best_use(self, has_chart: bool, has_table: bool, has_picture: bool,
-                       content_placeholders: List[PlaceholderInfo],
-                       text_placeholders: List[PlaceholderInfo],
-                       spatial_groups: Dict,
-                       semantic_sections: List[Dict] = None,
-                       kpi_grid=None) -> List[str]:
-        """ENHANCED best use determination"""
+            layout_type = 'multi_column'
+        
+        # Layout story
+        if kpi_grid:
+            layout_story = f"KPI Dashboard ({kpi_grid['rows']}x{kpi_grid['cols']} metrics)"
+        elif section_count >= 3:
+            layout_story = f"{section_count} topic sections"
+        elif has_chart:
+            layout_story = "Chart with supporting text"
+        elif has_table:
+            layout_story = "Data table presentation"
+        elif has_two_columns:
+            layout_story = "Two column comparison"
+        elif num_groups == 3 and all('column' in g for g in group_names):
+            layout_story = "Three column layout"
+        elif num_groups >= 1 and all('row' in g for g in group_names):
+            layout_story = f"Vertical stack ({num_groups} sections)"
+        elif num_groups == 1:
+            layout_story = "Single content area"
+        else:
+            layout_story = f"Multi-area layout ({num_groups} areas)"
+        
+        # Best use
         best_for = []
         
         if kpi_grid:
@@ -869,15 +854,12 @@ class TemplateAnalyzer:
         if has_table:
             best_for.append('table')
         
-        # ADDED: Section-based inference
         if semantic_sections:
             for section in semantic_sections:
                 if 'best_for' in section:
                     best_for.extend(section['best_for'])
         
-        num_groups = len(spatial_groups)
-        
-        if 'left_column' in spatial_groups and 'right_column' in spatial_groups:
+        if has_two_columns:
             best_for.extend(['comparison', 'before_after'])
         
         if num_groups == 3:
@@ -886,14 +868,13 @@ class TemplateAnalyzer:
         if num_groups >= 4 and not kpi_grid:
             best_for.append('icon_grid')
         
-        medium_areas = [ph for ph in content_placeholders if ph.is_medium_box]
-        if medium_areas:
+        if any(ph.is_medium_box for ph in content_placeholders):
             best_for.append('pictogram')
         
         if not best_for:
             best_for.append('bullets')
         
-        return list(set(best_for))  # Remove duplicates
+        return layout_type, layout_story, list(set(best_for))  # Remove duplicates
     
     def export_analysis(self) -> dict:
         """Existing export - unchanged"""
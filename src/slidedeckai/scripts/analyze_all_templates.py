@@ -1,20 +1,32 @@
 """
 Analyze all templates and save their capabilities.
-Run this once to understand your templates.
-"""
-import sys
-import os
-import json
+Run this once to understand your templates:
 
-sys.path.insert(0, os.path.abspath('src'))
+    python -m slidedeckai.scripts.analyze_all_templates
 
-from slidedeckai.global_config import GlobalConfig
-from slidedeckai.layout_analyzer import TemplateAnalyzer
-from pptx import Presentation
+or, once the package is installed, via the ``analyze-templates`` command.
+"""
+import argparse
+import json
 
 
 def analyze_all_templates():
     """Analyze all configured templates."""
+    # Parsed before the imports below, so --help answers at once
+    parser = argparse.ArgumentParser(
+        prog='analyze-templates',
+        description='Analyze every configured PowerPoint template and save its capabilities.',
+        epilog='Writes template_analysis_<key>.json for each template and'
+               ' all_templates_analysis.json to the current directory.'
+    )
+    parser.parse_args()
+
+    # Heavy imports are deferred so that importing this module stays cheap
+    from pptx import Presentation
+
+    from slidedeckai.global_config import GlobalConfig
+    from slidedeckai.layout_analyzer import TemplateAnalyzer
+
     print("\n" + "="*80)
     print("ANALYZING ALL TEMPLATES")
     print("="*80 + "\n")
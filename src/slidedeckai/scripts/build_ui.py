@@ -0,0 +1,57 @@
+"""
+Minify and precompress the web UI's static assets.
+Run this before building a release:
+
+    python -m slidedeckai.scripts.build_ui
+
+This is a maintainer tool (it needs ``esbuild`` on PATH) and is not
+installed as a command. The minified files are written next to their
+sources (``*.min.js``, ``*.min.css``) and are preferred by the UI while
+they match their source. Every script and stylesheet also gets ``.gz`` (and, with brotli installed, ``.br``) siblings,
+which the UI serves instead of compressing at startup. Wheel builds run
+the precompression step on their own through ``setup.py``.
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from ..ui._assets import precompress, source_banner
+
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / 'ui' / 'static'
+
+# Source file -> extra esbuild flags
+ASSETS = {
+    'slidedeck.js': ['--pure:console.log', '--pure:console.debug', '--target=es2020'],
+    'slidedeck.css': [],
+}
+
+
+def build_ui() -> int:
+    """Minify and precompress each static asset; return a non-zero code if esbuild is unavailable or fails."""
+    esbuild = shutil.which('esbuild')
+    if not esbuild:
+        print('esbuild not found on PATH; install it with `npm install -g esbuild`')
+        return 1
+
+    for file_name, flags in ASSETS.items():
+        stem, ext = file_name.rsplit('.', 1)
+        out_file = STATIC_DIR / f'{stem}.min.{ext}'
+        banner = source_banner((STATIC_DIR / file_name).read_bytes())
+        result = subprocess.run(
+            [esbuild, str(STATIC_DIR / file_name), '--minify', *flags,
+             f'--banner:{ext}={banner}', f'--outfile={out_file}'],
+            check=False
+        )
+        if result.returncode != 0:
+            print(f'Failed to minify {file_name}')
+            return result.returncode
+        print(f'Minified {file_name} -> {out_file.name}')
+
+    precompress(STATIC_DIR)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(build_ui())
@@ -0,0 +1,48 @@
+"""
+Helpers shared by the web UI and its build step (scripts/build_ui.py, setup.py).
+Only the standard library (and brotli, when installed) may be imported here:
+setup.py loads this file by path, before the package's dependencies exist.
+"""
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content-Encoding -> suffix of the precompressed file written next to an asset
+FILE_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+def source_banner(source: bytes) -> str:
+    """
+    Comment written at the top of a minified file, naming the source it was
+    built from. The UI only serves a minified file that starts with the
+    banner of the current source.
+    """
+    return f'/* built from source sha1:{hashlib.sha1(source).hexdigest()} */'
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """Compress a response body once for each supported Content-Encoding"""
+    # mtime=0 keeps the gzip output identical across workers and restarts
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def precompress(static_dir: Path, log: Callable[[str], None] = print):
+    """
+    Write gzip and Brotli encodings next to each script and stylesheet,
+    reporting each file through `log` (ASCII only, so any console can show it).
+    """
+    for path in sorted(static_dir.iterdir()):
+        if path.suffix not in ('.js', '.css'):
+            continue
+        for encoding, encoded in compress_variants(path.read_bytes()).items():
+            path.with_name(path.name + FILE_SUFFIXES[encoding]).write_bytes(encoded)
+        log(f'precompressed {path.name}')
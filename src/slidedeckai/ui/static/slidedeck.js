@@ -0,0 +1,1214 @@
+let selectedMode = 'normal';
+let currentPlan = null;
+let reportId = null;
+let templateOptions = {};
+let planSectionsCollapsed = false;
+let validModels = {};
+let currentPreviewSlides = [];
+let currentSlideIndex = 0;
+
+// Elements used by the hot handlers, looked up once on DOMContentLoaded
+const $ = id => document.getElementById(id);
+const DOM = {};
+
+// Initial state embedded in the page by the server
+const BOOT = JSON.parse(document.getElementById('boot')?.textContent || '{}');
+
+// Trace logging is off unless the server runs with DEBUG_HTML set
+const DEBUG = Boolean(BOOT.debug);
+
+// Chat transcript lives here; only a window of it is kept in the DOM
+const CHAT_WINDOW = 50;
+const CHAT_VIRTUALIZE_AT = 200;
+let chatLog = [{ role: 'ai', text: 'Select a slide and ask me to make changes!' }];
+let chatWindowStart = 0;
+
+// One delegated click listener; clickable elements opt in via data-action
+const CLICK_ACTIONS = {
+    'toggle-settings': () => toggleSettings(),
+    'select-mode': el => selectMode(el.dataset.mode),
+    'toggle-source': el => toggleSource(el.value),
+    'set-query': el => setQuery(el.dataset.query),
+    'generate-plan': () => generatePlan(),
+    'toggle-plan-sections': () => togglePlanSections(),
+    'approve-plan': () => approvePlan(),
+    'edit-plan': () => editPlan(),
+    'add-section': () => addSection(),
+    'delete-section': el => deleteSection(el.closest('.edit-section')),
+    'add-query': el => addQuery(el.closest('.edit-section')),
+    'delete-query': el => deleteQuery(el.closest('.query-item')),
+    'save-edits': () => saveEdits(),
+    'cancel-edits': () => cancelEdits(),
+    'download': el => download(el.dataset.format),
+    'prev-slide': () => prevSlide(),
+    'next-slide': () => nextSlide(),
+    'send-chat': () => sendChat()
+};
+
+document.body.addEventListener('click', e => {
+    const target = e.target.closest('[data-action]');
+    if (!target) return;
+    const handler = CLICK_ACTIONS[target.dataset.action];
+    if (handler) handler(target);
+});
+
+function toggleSettings() {
+    const el = document.getElementById('settingsSection');
+    const show = el.classList.contains('hidden');
+    // Re-arm the layer hint for the slide-in; it is dropped again on animationend
+    if (show) el.style.willChange = '';
+    el.classList.toggle('hidden', !show);
+}
+
+function updateModelOptions() {
+    const provider = DOM.llmProvider.value;
+    const modelSelect = DOM.llmModel;
+    const baseUrlGroup = DOM.baseUrlGroup;
+
+    // Show Base URL for certain providers if needed (e.g. Azure, Ollama)
+    baseUrlGroup.classList.toggle('hidden', provider !== 'az' && provider !== 'ol');
+
+    // The server renders each provider's options into a <template>; clone it
+    // in with one insertion (values match the format in GlobalConfig)
+    const tpl = document.getElementById('models-' + provider);
+    if (tpl) {
+        modelSelect.replaceChildren(tpl.content.cloneNode(true));
+    } else {
+        modelSelect.replaceChildren();
+    }
+
+    // Trigger selection of first model
+    if (modelSelect.options.length > 0) modelSelect.selectedIndex = 0;
+}
+
+// Single page initialization: cache elements, wire listeners, load models and templates
+document.addEventListener('DOMContentLoaded', () => {
+    DEBUG && console.log('🚀 Page loaded, initializing...');
+    DOM.template = $('template');
+    DOM.query = $('query');
+    DOM.fileTopic = $('fileTopic');
+    DOM.contentFile = $('contentFile');
+    DOM.chartFile = $('chartFile');
+    DOM.llmProvider = $('llmProvider');
+    DOM.llmModel = $('llmModel');
+    DOM.baseUrlGroup = $('baseUrlGroup');
+    DOM.apiKey = $('apiKey');
+    DOM.apiBaseUrl = $('apiBaseUrl');
+    DOM.spinner = $('spinner');
+    DOM.status = $('status');
+    DOM.planReview = $('planReview');
+    DOM.modeCards = document.querySelectorAll('.mode-card');
+    DOM.previewContainer = $('previewContainer');
+    DOM.slideCounter = $('slideCounter');
+    DOM.previewTitle = $('previewTitle');
+    DOM.previewBullets = $('previewBullets');
+    DOM.chatInput = $('chatInput');
+    DOM.chatMessages = $('chatMessages');
+
+    const settingsSection = document.getElementById('settingsSection');
+    settingsSection.addEventListener('animationend', () => {
+        // Release the compositor layer once the slide-in has finished
+        settingsSection.style.willChange = 'auto';
+    });
+    const chatBox = DOM.chatMessages;
+    chatBox.addEventListener('scroll', () => {
+        if (chatBox.scrollTop < 100) loadOlderChatMessages();
+    }, { passive: true });
+    // Enter sends, like the send button; ignored while an IME is composing
+    DOM.chatInput.addEventListener('keydown', e => {
+        if (e.key === 'Enter' && !e.shiftKey && !e.isComposing) {
+            e.preventDefault();
+            sendChat();
+        }
+    });
+
+    $('planContent').addEventListener('toggle', hydratePlanSection, true);
+
+    updateModelOptions();
+    loadTemplates();
+}, { once: true });
+
+// Function to load templates from the backend
+async function loadTemplates() {
+    try {
+        if (BOOT.templates && Object.keys(BOOT.templates).length > 0) {
+            // The page already carries the template list; skip the round trip
+            templateOptions = BOOT.templates;
+        } else {
+            DEBUG && console.log('🔄 Loading templates from /api/templates...');
+            const response = await fetch('/api/templates');
+            DEBUG && console.log('📡 Response status:', response.status);
+
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+
+            templateOptions = await response.json();
+        }
+        DEBUG && console.log('✅ Templates received:', templateOptions);
+
+        const templateSelect = DOM.template;
+
+        // Check if we got valid data
+        if (!templateOptions || Object.keys(templateOptions).length === 0) {
+            throw new Error('No templates returned from server');
+        }
+
+        // Add options from the fetched data with a single insertion
+        // (value sent to backend and label are both the key, not the caption)
+        const frag = document.createDocumentFragment();
+        Object.keys(templateOptions).forEach(key => {
+            const opt = document.createElement('option');
+            opt.value = key;
+            opt.textContent = key;
+            frag.appendChild(opt);
+        });
+        templateSelect.replaceChildren(frag);
+
+        // Set default selection
+        templateSelect.value = Object.keys(templateOptions)[0];
+        DEBUG && console.log('✅ Templates loaded successfully');
+
+    } catch (error) {
+        console.error('❌ Error loading templates:', error);
+        // Fallback to hardcoded options
+        const templateSelect = DOM.template;
+            templateSelect.innerHTML = `
+                <option value="Basic">Basic</option>
+                <option value="Ion Boardroom">Ion Boardroom</option>
+                <option value="Minimalist Sales Pitch">Minimalist Sales Pitch</option>
+                <option value="Urban Monochrome">Urban Monochrome</option>
+                <option value="RRD Template">RRD Template</option>
+                <option value="WilliamsLea">WilliamsLea</option>
+            `;
+        DEBUG && console.log('⚠️ Using fallback templates');
+    }
+}
+
+function selectMode(mode) {
+    selectedMode = mode;
+    DOM.modeCards.forEach(card => {
+        card.classList.toggle('selected', card.dataset.mode === mode);
+    });
+}
+
+function toggleSource(type) {
+    document.getElementById('searchSource').classList.toggle('hidden', type !== 'search');
+    document.getElementById('fileSource').classList.toggle('hidden', type === 'search');
+}
+
+function setQuery(text) {
+    DOM.query.value = text;
+    // Ensure search mode is selected
+    document.querySelector('input[name="sourceType"][value="search"]').click();
+}
+
+function showStatus(msg, type) {
+    const status = DOM.status;
+    status.textContent = msg;
+    status.className = 'status show ' + type;
+}
+
+async function generatePlan() {
+    const sourceType = document.querySelector('input[name="sourceType"]:checked').value;
+    let query = '';
+    let formData = new FormData();
+
+    formData.append('template', DOM.template.value);
+    formData.append('search_mode', selectedMode);
+
+    // Add Settings
+    const settings = [
+        ['api_key', DOM.apiKey.value],
+        ['llm_model', DOM.llmModel.value],
+        ['api_base', DOM.apiBaseUrl.value]
+    ];
+    for (const [key, value] of settings) {
+        if (value) formData.append(key, value);
+    }
+
+    if (sourceType === 'search') {
+        query = DOM.query.value.trim();
+        if (!query) {
+            showStatus('⚠️ Please enter a research query', 'error');
+            return;
+        }
+        formData.append('query', query);
+    } else {
+        const files = DOM.contentFile.files;
+        if (files.length === 0) {
+            showStatus('⚠️ Please upload at least one file', 'error');
+            return;
+        }
+        for (let i = 0; i < files.length; i++) {
+            formData.append('files', files[i]);
+        }
+        query = DOM.fileTopic.value.trim();
+        if (!query) {
+             showStatus('⚠️ Please enter a topic for the files', 'error');
+             return;
+        }
+        formData.append('query', query);
+    }
+
+    // Chart file
+    const chartFile = DOM.chartFile.files[0];
+    if (chartFile) {
+        formData.append('chart_file', chartFile);
+    }
+
+    DOM.spinner.classList.add('show');
+    DOM.planReview.classList.remove('show');
+    showStatus('🔍 Analyzing input and generating research plan...', 'loading');
+
+    try {
+        DEBUG && console.log('🚀 Sending request to /api/plan');
+
+        const response = await fetch('/api/plan', {
+            method: 'POST',
+            body: formData // Send as FormData
+        });
+
+        DEBUG && console.log('📡 Response received');
+        DEBUG && console.log('📡 Response status:', response.status);
+        DEBUG && console.log('📡 Response ok:', response.ok);
+        DEBUG && console.log('📡 Response headers:', [...response.headers.entries()]);
+
+        if (!response.ok) {
+            const errorText = await response.text();
+            console.error('❌ Server error response:', errorText);
+            throw new Error('Plan generation failed: ' + errorText);
+        }
+
+        // Let the browser parse the body directly instead of via an intermediate string
+        let responseData;
+        try {
+            responseData = await response.json();
+        } catch (parseError) {
+            console.error('❌ JSON parse error:', parseError);
+            throw new Error('Invalid JSON response from server');
+        }
+
+        DEBUG && console.log('📦 Parsed response:', responseData);
+        DEBUG && console.log('📦 Response type:', typeof responseData);
+        DEBUG && console.log('📦 Response keys:', Object.keys(responseData));
+        DEBUG && console.log('📦 Has sections?:', 'sections' in responseData);
+        DEBUG && console.log('📦 Sections value:', responseData.sections);
+        DEBUG && console.log('📦 Sections type:', typeof responseData.sections);
+        DEBUG && console.log('📦 Sections is array?:', Array.isArray(responseData.sections));
+        DEBUG && console.log('📦 Sections length:', responseData.sections?.length);
+
+        if (!responseData.sections) {
+            console.error('❌ responseData.sections is falsy:', responseData.sections);
+            throw new Error('Response missing sections field');
+        }
+
+        if (!Array.isArray(responseData.sections)) {
+            console.error('❌ responseData.sections is not an array:', typeof responseData.sections);
+            throw new Error('Response sections is not an array: ' + typeof responseData.sections);
+        }
+
+        if (responseData.sections.length === 0) {
+            console.warn('⚠️ responseData.sections is empty array');
+        }
+
+        internPlanStrings(responseData);
+        currentPlan = responseData;
+        DEBUG && console.log('✅ Set currentPlan:', currentPlan);
+
+        displayPlan(currentPlan);
+
+        DOM.spinner.classList.remove('show');
+        showStatus('✅ Research plan ready for review!', 'success');
+        DOM.planReview.classList.add('show');
+
+    } catch (error) {
+        DOM.spinner.classList.remove('show');
+        console.error('❌ Full error object:', error);
+        console.error('❌ Error stack:', error.stack);
+        showStatus('❌ Error: ' + error.message, 'error');
+    }
+}
+
+function displayPlan(plan) {
+    if (reportId === null) planSectionsCollapsed = false;
+    const content = document.getElementById('planContent');
+
+    // ✅ SAFETY CHECK: Ensure plan.sections exists and is an array
+    if (!plan || !plan.sections || !Array.isArray(plan.sections)) {
+        console.error('❌ Invalid plan structure:', plan);
+        replaceWithHtml(content, `
+            <div style="padding: 20px; background: #fee2e2; border-radius: 8px; color: #991b1b;">
+                <strong>⚠️ Error:</strong> Invalid plan structure received from server.
+                <br><small>Please try generating the plan again.</small>
+            </div>
+        `);
+        return;
+    }
+
+    DEBUG && console.log('✅ displayPlan called with valid plan:', plan);
+    DEBUG && console.log('✅ Number of sections:', plan.sections.length);
+
+    // Static markup comes from <template>s parsed once with the page; each
+    // render only clones them and fills in text, so nothing is re-parsed
+    const header = cloneTemplate('planHeaderTpl');
+    header.querySelector('.plan-report-type').textContent = plan.analysis?.report_type || 'N/A';
+    header.querySelector('.plan-subject').textContent = plan.analysis?.core_subject || plan.query || '';
+    header.querySelector('.plan-total-queries').textContent = plan.total_queries || 0;
+    header.querySelector('.plan-template').textContent = plan.template || 'Default';
+
+    const sectionsContainer = document.createElement('div');
+    sectionsContainer.id = 'planSectionsContainer';
+    renderedPlan = plan;
+
+    // The first few sections render right away; large plans get the rest
+    // appended in frame-sized chunks so the main thread is not blocked
+    const sections = plan.sections;
+    let next = Math.min(sections.length, PLAN_SYNC_SECTIONS);
+    for (let idx = 0; idx < next; idx++) {
+        sectionsContainer.appendChild(buildPlanSection(sections[idx], idx));
+    }
+
+    // The sections are assembled off-document and inserted in one go
+    DEBUG && console.log('✅ Inserting plan');
+    mutateDetached(content, () => content.replaceChildren(header, sectionsContainer));
+
+    DEBUG && console.log('✅ Setting collapsed state');
+    setPlanSectionsCollapsed(planSectionsCollapsed);
+
+    const renderToken = ++planRenderToken;
+    const renderChunk = () => {
+        // A newer render, or the edit view, has replaced this container
+        if (renderToken !== planRenderToken || !sectionsContainer.isConnected) return;
+        const deadline = performance.now() + PLAN_CHUNK_BUDGET_MS;
+        const chunk = document.createDocumentFragment();
+        while (next < sections.length && performance.now() < deadline) {
+            chunk.appendChild(buildPlanSection(sections[next], next));
+            next++;
+        }
+        sectionsContainer.appendChild(chunk);
+        if (next < sections.length) requestAnimationFrame(renderChunk);
+    };
+    if (next < sections.length) requestAnimationFrame(renderChunk);
+
+    DEBUG && console.log('✅ displayPlan completed successfully');
+}
+
+// Low-cardinality plan fields repeat across every section and query; share
+// one copy of each value so long editing sessions retain a single string
+const _internedStrings = new Map();
+function intern(str) {
+    if (typeof str !== 'string') return str;
+    const shared = _internedStrings.get(str);
+    if (shared !== undefined) return shared;
+    _internedStrings.set(str, str);
+    return str;
+}
+
+function internPlanStrings(plan) {
+    for (const section of plan.sections) {
+        section.layout_type = intern(section.layout_type);
+        if (!Array.isArray(section.placeholder_specs)) continue;
+        for (const spec of section.placeholder_specs) {
+            spec.content_type = intern(spec.content_type);
+            spec.placeholder_type = intern(spec.placeholder_type);
+            if (!Array.isArray(spec.search_queries)) continue;
+            for (const q of spec.search_queries) q.expected_source_type = intern(q.expected_source_type);
+        }
+    }
+}
+
+// All search queries of a section's placeholder_specs, in order, pushed
+// into one array rather than re-copied by concat for every spec
+function flattenSearchQueries(section) {
+    const searchQueries = [];
+    if (!Array.isArray(section.placeholder_specs)) return searchQueries;
+    for (const spec of section.placeholder_specs) {
+        const queries = spec.search_queries;
+        if (!Array.isArray(queries)) continue;
+        for (let i = 0; i < queries.length; i++) searchQueries.push(queries[i]);
+    }
+    return searchQueries;
+}
+
+// Rendered plan sections keyed by everything they display; entries are never
+// inserted themselves, only cloned, so they stay valid across re-renders
+const PLAN_SECTION_CACHE_SIZE = 200;
+const planSectionCache = new Map();
+// Plan whose sections are currently shown, for filling in bodies on expand
+let renderedPlan = null;
+// Sections rendered before the plan is shown; the rest follow in chunks of
+// at most PLAN_CHUNK_BUDGET_MS per frame
+const PLAN_SYNC_SECTIONS = 5;
+const PLAN_CHUNK_BUDGET_MS = 8;
+let planRenderToken = 0;
+
+function buildPlanSection(section, idx) {
+    DEBUG && console.log(`Processing section ${idx}:`, section.section_title);
+
+    // Extract search queries from placeholder_specs
+    const searchQueries = flattenSearchQueries(section);
+
+    DEBUG && console.log(`  Section ${idx} has ${searchQueries.length} search queries`);
+
+    // Sections whose content is unchanged since an earlier render are cloned from the cache
+    const key = planSectionKey(section, idx, searchQueries);
+    let cached = planSectionCache.get(key);
+    if (!cached) {
+        cached = renderPlanSection(section, idx, searchQueries);
+        if (planSectionCache.size >= PLAN_SECTION_CACHE_SIZE) planSectionCache.clear();
+        planSectionCache.set(key, cached);
+    }
+    return cached.cloneNode(true);
+}
+
+function planSectionKey(section, idx, searchQueries) {
+    // Query and spec details are filled in on expand, so only their counts render here
+    return JSON.stringify([
+        idx,
+        section.section_title,
+        section.section_purpose,
+        section.layout_type,
+        section.layout_idx,
+        searchQueries.length,
+        section.placeholder_specs?.length || 0
+    ]);
+}
+
+function renderPlanSection(section, idx, searchQueries) {
+    const node = cloneTemplate('planSectionTpl');
+    node.id = `plan_section_${idx}`;
+    node.querySelector('h3').textContent = `${idx + 1}. ${section.section_title || 'Untitled Section'}`;
+    node.querySelector('.plan-purpose').textContent = section.section_purpose || 'No purpose specified';
+    node.querySelector('.plan-layout').textContent =
+        `${section.layout_type || 'N/A'} (Index: ${section.layout_idx || 'N/A'})`;
+    node.querySelector('.plan-query-count').textContent = searchQueries.length;
+
+    const specs = node.querySelector('.plan-specs');
+    if (section.placeholder_specs && section.placeholder_specs.length > 0) {
+        specs.querySelector('.plan-spec-count').textContent = section.placeholder_specs.length;
+    } else {
+        specs.remove();
+    }
+
+    // The query and spec lists sit in closed <details>; they are built on first open
+    node.dataset.sectionIdx = idx;
+    node.dataset.pending = '1';
+
+    return node;
+}
+
+function renderPlanSectionBody(node, section, searchQueries) {
+    const queryList = node.querySelector('.query-list');
+    if (searchQueries.length > 0) {
+        searchQueries.forEach(q => {
+            const item = cloneTemplate('planQueryTpl');
+            item.querySelector('.plan-query').textContent = q.query || 'No query';
+            item.querySelector('.plan-query-purpose').textContent = q.purpose || 'N/A';
+            queryList.appendChild(item);
+        });
+    } else {
+        const item = document.createElement('li');
+        item.className = 'empty';
+        item.textContent = 'No search queries defined';
+        queryList.appendChild(item);
+    }
+
+    const specList = node.querySelector('.plan-spec-list');
+    if (specList) {
+        section.placeholder_specs.forEach(spec => {
+            const item = cloneTemplate('planSpecTpl');
+            item.querySelector('.spec-idx').textContent = spec.placeholder_idx ?? '';
+            item.querySelector('.spec-type').textContent = spec.placeholder_type ?? '';
+            item.querySelector('.spec-content-type').textContent = spec.content_type ?? '';
+            item.querySelector('.spec-description').textContent = spec.content_description ?? '';
+            specList.appendChild(item);
+        });
+    }
+}
+
+// Fill a section's lists the first time one of its <details> opens; toggle
+// does not bubble, so this listens in the capture phase on #planContent
+function hydratePlanSection(e) {
+    if (!e.target.open) return;
+    const node = e.target.closest('.plan-section[data-pending]');
+    const section = node && renderedPlan?.sections[Number(node.dataset.sectionIdx)];
+    if (!section) return;
+    delete node.dataset.pending;
+    renderPlanSectionBody(node, section, flattenSearchQueries(section));
+}
+
+function setPlanSectionsCollapsed(collapsed) {
+    const container = document.getElementById('planSectionsContainer');
+    const btn = document.getElementById('togglePlanBtn');
+
+    if (!container || !btn) {
+        console.warn('setPlanSectionsCollapsed: elements not found');
+        return;
+    }
+
+    planSectionsCollapsed = collapsed;
+
+    container.classList.toggle('hidden', planSectionsCollapsed);
+    btn.textContent = planSectionsCollapsed ? '▶ Expand All' : '▼ Collapse All';
+}
+
+function togglePlanSections() {
+    planSectionsCollapsed = !planSectionsCollapsed;
+    setPlanSectionsCollapsed(planSectionsCollapsed);     // 🔥 force UI update after toggle
+    const btn = document.getElementById('togglePlanBtn');
+    if (btn) btn.blur();          // optional UX (prevents button staying focused)
+}
+
+function approvePlan() {
+    DEBUG && console.log('🔍 Current plan:', currentPlan);
+    if (!currentPlan || !currentPlan.plan_id) {
+        console.error('❌ No plan_id found!', currentPlan);  // ✅ DEBUG
+        showStatus('❌ No plan available to execute', 'error');
+        return;
+    }
+
+    DEBUG && console.log('✅ Sending plan_id:', currentPlan.plan_id); 
+
+    // Collapse sections BEFORE starting generation
+    planSectionsCollapsed = true;
+    setPlanSectionsCollapsed(planSectionsCollapsed);
+
+    DOM.spinner.classList.add('show');
+    showStatus('🚀 Generating slides with SlideDeck AI...', 'loading');
+    // Lay out the preview pane now so it only needs filling in when slides arrive
+    renderPreviewSkeleton(currentPlan.sections.length + 2);
+
+    fetch('/api/execute', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({ 
+            plan_id: currentPlan.plan_id  // ✅ FIXED - send plan_id only
+        })
+    })
+    .then(response => {
+        if (!response.ok) {
+            return response.json().then(err => {
+                throw new Error(err.error || 'Slide generation failed');
+            });
+        }
+        return response.json();
+    })
+    .then(result => {
+        reportId = result.report_id;
+        DOM.spinner.classList.remove('show');
+        showStatus(`✅ Slides generated successfully! (${result.slides_generated} slides in ${result.execution_time})`, 'success');
+        document.getElementById('downloadSection').classList.add('show');
+        loadPreview(reportId);
+    })
+    .catch(error => {
+        DOM.spinner.classList.remove('show');
+        document.getElementById('previewContainer').classList.add('hidden');
+        showStatus('❌ Error: ' + error.message, 'error');
+        console.error('Execution error:', error);
+    });
+}
+
+function editPlan() {
+    const content = document.getElementById('planContent');
+    // Markup is collected in an array and joined once at the end
+    const parts = ['<h3 class="edit-heading">✏️ Edit Research Plan</h3>'];
+
+    // ✅ Safety check
+    if (!currentPlan || !currentPlan.sections || !Array.isArray(currentPlan.sections)) {
+        parts.push('<p class="edit-error">Error: Invalid plan structure. Cannot edit.</p>');
+        replaceWithHtml(content, parts.join(''));
+        return;
+    }
+
+    // Counted from the queries being edited; the add/delete handlers keep it current
+    currentPlan.total_queries = 0;
+    currentPlan.sections.forEach((section, idx) => {
+        // ✅ Extract search queries from NEW FORMAT (placeholder_specs)
+        const searchQueries = flattenSearchQueries(section);
+
+        // ✅ Store in OLD format for backward compatibility with edit UI
+        section.search_queries = searchQueries;
+        currentPlan.total_queries += searchQueries.length;
+
+        parts.push(editSectionHtml(section));
+    });
+
+    parts.push(`
+        <div class="edit-add-section">
+            <button class="btn-add-section" data-action="add-section">
+                ➕ Add New Section
+            </button>
+        </div>
+        <div class="edit-actions">
+            <button class="btn" data-action="save-edits">💾 Save Changes</button>
+            <button class="btn btn-cancel" data-action="cancel-edits">❌ Cancel</button>
+        </div>
+    `);
+
+    mutateDetached(content, () => {
+        replaceWithHtml(content, parts.join(''));
+
+        // Query rows are cloned from a template rather than re-parsed per query
+        const containers = content.querySelectorAll('.section-queries');
+        currentPlan.sections.forEach((section, idx) => fillQueryRows(containers[idx], section));
+    });
+
+    showStatus('✏️ Editing mode active - update sections above', 'loading');
+}
+
+// Edit sections and query rows carry no indices: a node's position among its
+// siblings is its index into the plan, so deletes need no renumbering and the
+// "Section N" labels come from a CSS counter
+function editSectionHtml(section) {
+    return `
+        <div class="plan-section edit-section">
+            <button class="btn-delete-section" data-action="delete-section">
+                🗑️ Delete
+            </button>
+
+            <label class="edit-label section-label">Title:</label>
+            <input type="text" class="edit-input section-title" value="${escapeHtml(section.section_title || '')}">
+
+            <label class="edit-label spaced">Purpose:</label>
+            <textarea class="edit-input section-purpose">${escapeHtml(section.section_purpose || '')}</textarea>
+
+            <label class="edit-label spaced">Layout Type:</label>
+            <input type="text" class="edit-input section-layout" value="${escapeHtml(section.layout_type || 'single_column')}"
+                   placeholder="e.g., chart_layout, table_layout, double_column">
+
+            <div class="edit-queries">
+                <label class="edit-label">Search Queries:</label>
+                <div class="section-queries"></div>
+                <button class="btn-add-query" data-action="add-query">
+                    ➕ Add Query
+                </button>
+            </div>
+        </div>
+    `;
+}
+
+function fillQueryRows(container, section) {
+    const rows = document.createDocumentFragment();
+    section.search_queries.forEach(q => rows.appendChild(renderQueryRow(q)));
+    container.appendChild(rows);
+}
+
+function renderQueryRow(q) {
+    const row = cloneTemplate('queryRowTpl');
+
+    row.querySelector('.query-text').value = q.query || '';
+    row.querySelector('.query-purpose').value = q.purpose || '';
+
+    const sourceSelect = row.querySelector('.query-source');
+    sourceSelect.value = q.expected_source_type;
+    // Unknown source types fall back to the first option, as before
+    if (sourceSelect.selectedIndex < 0) sourceSelect.selectedIndex = 0;
+
+    return row;
+}
+
+function editSectionIndex(node) {
+    return Array.prototype.indexOf.call(node.parentNode.querySelectorAll(':scope > .edit-section'), node);
+}
+
+function queryRowIndex(row) {
+    return Array.prototype.indexOf.call(row.parentNode.children, row);
+}
+
+function updatePlanSectionsView() {
+    const container = document.getElementById('planSectionsContainer');
+    const btn = document.getElementById('togglePlanBtn');
+
+    if (!container || !btn) {
+        console.warn('updatePlanSectionsView: elements not found');
+        return;
+    }
+
+    container.classList.toggle('hidden', planSectionsCollapsed);
+    btn.textContent = planSectionsCollapsed ? '▶ Expand All' : '▼ Collapse All';
+}
+
+// Apply a batch of mutations while the element is out of the document, so
+// style and layout are invalidated once on reinsertion. Lookups inside
+// `mutate` must go through the element, not document.getElementById.
+function mutateDetached(el, mutate) {
+    const parent = el.parentNode;
+    const next = el.nextSibling;
+    parent.removeChild(el);
+    try {
+        mutate();
+    } finally {
+        parent.insertBefore(el, next);
+    }
+}
+
+// Parse markup in an inert document and move the nodes in, so the parse
+// does not invalidate style and layout of the live page as it goes
+function replaceWithHtml(el, html) {
+    const doc = new DOMParser().parseFromString(html, 'text/html');
+    el.replaceChildren(...doc.body.childNodes);
+}
+
+function parseHtmlElement(html) {
+    return new DOMParser().parseFromString(html, 'text/html').body.firstElementChild;
+}
+
+// Clone the first element of a <template> from the page
+function cloneTemplate(id) {
+    return document.getElementById(id).content.firstElementChild.cloneNode(true);
+}
+
+// Single-pass escaping; strings that repeat across re-renders hit the cache
+const _escCache = new Map();
+const _escRe = /[&<>"']/g;
+const _escMap = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+
+function escapeHtml(text) {
+    const str = typeof text === 'string' ? text : String(text ?? '');
+    let escaped = _escCache.get(str);
+    if (escaped !== undefined) return escaped;
+    escaped = str.replace(_escRe, ch => _escMap[ch]);
+    if (_escCache.size < 500) _escCache.set(str, escaped);
+    return escaped;
+}
+
+// Scroll once the re-render is committed; rapid calls collapse into one frame
+let pendingScrollFrame = null;
+function scrollIntoViewNextFrame(getElement, options, onScrolled) {
+    if (pendingScrollFrame) cancelAnimationFrame(pendingScrollFrame);
+    pendingScrollFrame = requestAnimationFrame(() => {
+        pendingScrollFrame = null;
+        const element = getElement();
+        if (!element) return;
+        element.scrollIntoView(options);
+        if (onScrolled) onScrolled(element);
+    });
+}
+
+// Keep the plan's query count in step with single edits instead of recounting
+function adjustTotalQueries(delta) {
+    if (typeof currentPlan.total_queries !== 'number') {
+        currentPlan.total_queries = currentPlan.sections.reduce(
+            (sum, section) => sum + (section.search_queries || []).length,
+            0
+        );
+        return;
+    }
+    currentPlan.total_queries += delta;
+}
+
+function addSection() {
+    // Create a new section with default values
+    const newSection = {
+        section_title: "New Section",
+        section_purpose: "Describe the purpose of this section",
+        visualization_hint: "bullets",
+        search_queries: [
+            {
+                query: "Enter search query here",
+                purpose: "what this query targets",
+                expected_source_type: "research"
+            }
+        ]
+    };
+
+    // Add to current plan
+    currentPlan.sections.push(newSection);
+    adjustTotalQueries(newSection.search_queries.length);
+
+    // Append just the new section to the edit view
+    const node = parseHtmlElement(editSectionHtml(newSection));
+    fillQueryRows(node.querySelector('.section-queries'), newSection);
+    document.querySelector('#planContent .edit-add-section').before(node);
+
+    showStatus('✅ New section added! Scroll down to edit it.', 'success');
+
+    // Scroll to the new section
+    scrollIntoViewNextFrame(
+        () => node,
+        { behavior: 'smooth', block: 'center' },
+        element => {
+            element.style.border = '2px solid #2563eb';
+            setTimeout(() => {
+                element.style.border = '';
+            }, 2000);
+        }
+    );
+}
+
+function deleteSection(node) {
+    if (currentPlan.sections.length <= 1) {
+        showStatus('⚠️ Cannot delete the last section!', 'error');
+        return;
+    }
+
+    const sectionIdx = editSectionIndex(node);
+    const sectionTitle = currentPlan.sections[sectionIdx].section_title;
+
+    if (confirm(`Are you sure you want to delete "${sectionTitle}"?`)) {
+        // Remove the section
+        const [removed] = currentPlan.sections.splice(sectionIdx, 1);
+        adjustTotalQueries(-removed.search_queries.length);
+
+        // The sections after it move up by position; nothing to renumber
+        node.remove();
+
+        showStatus(`✅ Section "${sectionTitle}" deleted.`, 'success');
+    }
+}
+
+function addQuery(sectionNode) {
+    const newQuery = {
+        query: "Enter new search query",
+        purpose: "what this query targets",
+        expected_source_type: "research"
+    };
+
+    // Add to section's queries
+    currentPlan.sections[editSectionIndex(sectionNode)].search_queries.push(newQuery);
+    adjustTotalQueries(1);
+
+    // Append just the new row to the section
+    const row = renderQueryRow(newQuery);
+    sectionNode.querySelector('.section-queries').appendChild(row);
+
+    showStatus('✅ New query added to section!', 'success');
+
+    // Auto-scroll to the new query
+    scrollIntoViewNextFrame(
+        () => row,
+        { behavior: 'smooth', block: 'nearest' }
+    );
+}
+
+function deleteQuery(row) {
+    const section = currentPlan.sections[editSectionIndex(row.closest('.edit-section'))];
+
+    if (section.search_queries.length <= 1) {
+        showStatus('⚠️ Each section must have at least one query!', 'error');
+        return;
+    }
+
+    if (confirm('Delete this search query?')) {
+        // Remove the query
+        section.search_queries.splice(queryRowIndex(row), 1);
+        adjustTotalQueries(-1);
+        row.remove();
+
+        showStatus('✅ Query deleted.', 'success');
+    }
+}
+
+function cancelEdits() {
+    // Revert the plan display to the current state (before editing)
+    displayPlan(currentPlan);
+    showStatus('📋 Edit cancelled. Plan is restored.', 'loading');
+}
+
+function saveEdits() {
+    try {
+        // Read and validate everything first; the plan is only touched once it is all valid
+        const updates = [];
+        const errors = [];
+
+        // One walk over the edit view; the nth section node is the nth plan section
+        const sectionNodes = document.getElementById('planContent').querySelectorAll('.edit-section');
+        for (const [idx, node] of sectionNodes.entries()) {
+            const section = currentPlan.sections[idx];
+            const title = node.querySelector('.section-title').value.trim();
+            const purpose = node.querySelector('.section-purpose').value.trim();
+
+            // Validate: fields must not be empty
+            if (!title || !purpose) {
+                errors.push(`Section ${updates.length + 1}: title and purpose cannot be empty.`);
+            }
+
+            // Update queries for this section
+            const queries = [];
+            for (const row of node.querySelectorAll('.query-item')) {
+                queries.push({
+                    query: row.querySelector('.query-text').value.trim(),
+                    purpose: row.querySelector('.query-purpose').value.trim(),
+                    expected_source_type: row.querySelector('.query-source').value
+                });
+            }
+
+            // Validate: must have at least one query
+            if (queries.length === 0) {
+                errors.push(`Section "${title || updates.length + 1}" must have at least one search query.`);
+            }
+
+            updates.push({ section, title, purpose, queries });
+        }
+
+        // Validate: must have at least one section
+        if (updates.length === 0) {
+            errors.push('Plan must have at least one section.');
+        }
+
+        if (errors.length) {
+            showStatus('❌ Error saving changes: ' + errors.join(' '), 'error');
+            return;
+        }
+
+        // Update the plan with cleaned sections
+        currentPlan.sections = updates.map(({ section, title, purpose, queries }) => {
+            section.section_title = title;
+            section.section_purpose = purpose;
+            section.search_queries = queries;
+            return section;
+        });
+        planSectionsCollapsed = true;
+
+        // Refresh the display (it will use the collapsed state)
+        displayPlan(currentPlan);
+
+        showStatus('✅ Changes saved! Review and approve to generate report.', 'success');
+
+    } catch (error) {
+        showStatus('❌ Error saving changes: ' + error.message, 'error');
+        console.error('Save error:', error);
+    }
+}
+
+async function download(format) {
+    if (!reportId) {
+        showStatus('❌ No report available to download', 'error');
+        return;
+    }
+
+    showStatus(`📥 Preparing ${format.toUpperCase()} download...`, 'loading');
+    const url = `/api/download/${reportId}?format=${format}`;
+
+    // A HEAD request reads only the status, so a missing report is
+    // reported here without downloading the file twice
+    try {
+        const response = await fetch(url, { method: 'HEAD' });
+        if (!response.ok) {
+            throw new Error(response.status === 404 ? 'Report not found' : `Server returned ${response.status}`);
+        }
+    } catch (error) {
+        showStatus(`❌ Download failed: ${error.message}`, 'error');
+        return;
+    }
+
+    // Let the browser fetch the file itself: it streams straight to disk
+    // instead of being buffered here and copied into a Blob
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = `report_${reportId}.${format === 'json' ? 'json' : 'pptx'}`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+
+    showStatus(`✅ ${format.toUpperCase()} download started`, 'success');
+}
+
+// Preview & Chat Functions
+function renderPreviewSkeleton(slideCount) {
+    DOM.slideCounter.textContent = `Slide 1 / ${slideCount}`;
+    const title = DOM.previewTitle;
+    title.textContent = 'Generating slides...';
+    title.classList.add('skeleton');
+    const placeholders = Array.from({ length: 3 }, () => {
+        const li = document.createElement('li');
+        li.className = 'skeleton';
+        return li;
+    });
+    DOM.previewBullets.replaceChildren(...placeholders);
+    DOM.previewContainer.classList.remove('hidden');
+}
+
+function loadPreview(id) {
+    fetch(`/api/preview/${id}`)
+    .then(res => res.json())
+    .then(data => {
+        if(data.slides) {
+            currentPreviewSlides = data.slides;
+            currentSlideIndex = 0;
+            DOM.previewContainer.classList.remove('hidden');
+            renderSlide(0);
+        }
+    })
+    .catch(err => console.error("Preview load failed", err));
+}
+
+function renderSlide(index) {
+    if(!currentPreviewSlides || currentPreviewSlides.length === 0) return;
+    const slide = currentPreviewSlides[index];
+    DOM.slideCounter.textContent = `Slide ${index + 1} / ${currentPreviewSlides.length}`;
+    const title = DOM.previewTitle;
+    title.textContent = slide.title || 'Untitled';
+    title.classList.remove('skeleton');
+
+    // Reuse the bullets already shown and only touch the ones that changed;
+    // extra bullets are built off-document and appended in one go
+    const items = Array.isArray(slide.content) ? slide.content : ['(Visual Content)'];
+    const list = DOM.previewBullets;
+    const existing = list.children;
+    const added = document.createDocumentFragment();
+    items.forEach((item, i) => {
+        let li = existing[i];
+        if (!li) {
+            li = added.appendChild(document.createElement('li'));
+        } else if (li.className) {
+            li.className = '';  // skeleton placeholder
+        }
+        const text = String(item);
+        if (li.textContent !== text) li.textContent = text;
+    });
+    while (existing.length > items.length) list.lastElementChild.remove();
+    list.appendChild(added);
+}
+
+function prevSlide() {
+    if(currentSlideIndex > 0) {
+        currentSlideIndex--;
+        renderSlide(currentSlideIndex);
+    }
+}
+
+function nextSlide() {
+    if(currentSlideIndex < currentPreviewSlides.length - 1) {
+        currentSlideIndex++;
+        renderSlide(currentSlideIndex);
+    }
+}
+
+// Messages sent in quick succession are coalesced into one /api/chat round trip
+const CHAT_DEBOUNCE_MS = 600;
+let pendingChat = [];
+let chatFlushTimer = null;
+let chatInflight = false;
+
+// The same instruction for the same slide repeated within this window of a
+// successful send is answered from that send's reply instead of the server
+const CHAT_REPEAT_MS = 2000;
+let lastChatSend = null;
+
+function sendChat() {
+    const input = DOM.chatInput;
+    const msg = input.value.trim();
+    if(!msg || !reportId) return;
+
+    appendChatMessage('user', msg);
+    input.value = '';
+
+    const now = performance.now();
+    const last = lastChatSend;
+    if (last && !last.failed && last.msg === msg && last.slideIdx === currentSlideIndex
+            && now - last.at < CHAT_REPEAT_MS) {
+        appendChatMessage('ai', last.reply ?? 'Already sent - the reply to this message will appear below.');
+        return;
+    }
+
+    // Only real sends open a repeat window; repeats answered above do not extend it
+    const send = { msg, slideIdx: currentSlideIndex, at: now, reply: null, failed: false };
+    lastChatSend = send;
+    pendingChat.push(send);
+    // While a request is in flight, flushChat picks the queue up when it returns
+    if (!chatInflight) {
+        clearTimeout(chatFlushTimer);
+        chatFlushTimer = setTimeout(flushChat, CHAT_DEBOUNCE_MS);
+    }
+}
+
+async function flushChat() {
+    chatFlushTimer = null;
+    if (pendingChat.length === 0) return;
+
+    // Only consecutive messages about the same slide share a request
+    const slideIdx = pendingChat[0].slideIdx;
+    let count = 1;
+    while (count < pendingChat.length && pendingChat[count].slideIdx === slideIdx) count++;
+    const batch = pendingChat.splice(0, count);
+
+    chatInflight = true;
+    try {
+        const res = await fetch('/api/chat', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                report_id: reportId,
+                slide_idx: slideIdx,
+                instructions: batch.map(item => item.msg)
+            })
+        });
+        const data = await res.json();
+        if (!res.ok) throw new Error(data.error || `Server returned ${res.status}`);
+
+        appendChatMessage('ai', data.message);
+        for (const item of batch) item.reply = data.message;
+
+        // If demo, update content locally
+        if(data.updated_content) {
+            currentPreviewSlides[slideIdx].title = data.updated_content.title;
+            currentPreviewSlides[slideIdx].content = data.updated_content.bullets;
+            if (slideIdx === currentSlideIndex) renderSlide(slideIdx);
+        }
+
+    } catch(e) {
+        // A failed send can be retried straight away
+        for (const item of batch) item.failed = true;
+        appendChatMessage('ai', `Error: ${e.message}`, true);
+    } finally {
+        chatInflight = false;
+    }
+
+    // Anything queued while waiting goes out as the next batch
+    if (pendingChat.length) flushChat();
+}
+
+function createChatBubble(entry) {
+    // Bubbles are built as nodes; textContent keeps message text out of the HTML parser
+    const bubble = document.createElement('div');
+    bubble.className = entry.isError ? 'message ai error' : `message ${entry.role}`;
+    bubble.textContent = entry.text;
+    return bubble;
+}
+
+// New bubbles are queued and added once per frame, so a burst of messages
+// costs one insertion, one layout and one scroll
+const pendingBubbles = [];
+let chatBubbleFrame = null;
+
+function appendChatMessage(role, text, isError = false) {
+    const entry = { role, text, isError };
+    chatLog.push(entry);
+    const bubble = createChatBubble(entry);
+    pendingBubbles.push(bubble);
+    if (!chatBubbleFrame) chatBubbleFrame = requestAnimationFrame(flushChatBubbles);
+}
+
+function flushChatBubbles() {
+    chatBubbleFrame = null;
+    const chatBox = DOM.chatMessages;
+    const bubbles = document.createDocumentFragment();
+    for (const bubble of pendingBubbles) bubbles.appendChild(bubble);
+    pendingBubbles.length = 0;
+    chatBox.appendChild(bubbles);
+
+    // Long conversations keep only the newest CHAT_WINDOW bubbles in the DOM
+    if (chatLog.length > CHAT_VIRTUALIZE_AT) {
+        const keepFrom = chatLog.length - CHAT_WINDOW;
+        while (chatWindowStart < keepFrom && chatBox.firstElementChild) {
+            chatBox.firstElementChild.remove();
+            chatWindowStart++;
+        }
+    }
+    chatBox.scrollTop = chatBox.scrollHeight;
+}
+
+function loadOlderChatMessages() {
+    if (chatWindowStart === 0) return;
+    const chatBox = DOM.chatMessages;
+    const prevHeight = chatBox.scrollHeight;
+    const from = Math.max(0, chatWindowStart - CHAT_WINDOW);
+    for (let i = chatWindowStart - 1; i >= from; i--) {
+        chatBox.insertBefore(createChatBubble(chatLog[i]), chatBox.firstChild);
+    }
+    chatWindowStart = from;
+    // Keep the bubble the user was looking at in place
+    chatBox.scrollTop += chatBox.scrollHeight - prevHeight;
+}